@@ -4,27 +4,176 @@
 
 import streamlit as st
 import pandas as pd
-import requests
+import numpy as np
+import httpx
 import os
-from streamlit_extras.metric_cards import style_metric_cards
+import functools
+import threading
+import diskcache
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # App-Konfiguration (Layout und Titel festlegen)
 st.set_page_config(page_title="SeedTogether Pflanzenberater", layout="wide")
 
+# Gemeinsamer HTTP-Client (HTTP/2, Keep-Alive) – als Ressource gecacht, damit er
+# Reruns überdauert und nicht bei jeder Interaktion neu aufgebaut wird
+@st.cache_resource
+def get_http() -> httpx.Client:
+    """
+    Liefert den gemeinsamen HTTP-Client für alle API-Abfragen.
+
+    Returns:
+        httpx.Client: Client mit Verbindungspool
+    """
+    return httpx.Client(
+        http2=True,
+        timeout=5.0,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=16),
+    )
+
+# Persistenter Cache für API-Antworten, überlebt Neustarts des Streamlit-Servers
+@st.cache_resource
+def get_cache() -> diskcache.Cache:
+    """
+    Öffnet den Disk-Cache einmal pro Prozess.
+
+    Returns:
+        diskcache.Cache: Cache im Verzeichnis .cache_openmeteo
+    """
+    return diskcache.Cache(os.path.join(os.getcwd(), ".cache_openmeteo"))
+
+cache = get_cache()
+
 # Daten einlesen aus der lokalen CSV-Datei, "pflanzen_erweitert.csv"
 @st.cache_data(show_spinner=False)
 def lade_csv() -> pd.DataFrame:
     """
     Liest die CSV-Datei mit Pflanzendaten ein und bereinigt die Spaltennamen.
+    Legt zusätzlich kleingeschriebene Filterspalten (*_lc) als Kategorien an,
+    damit sie nicht bei jedem Rerun neu berechnet werden.
 
     Returns:
         pd.DataFrame: Tabelle mit Pflanzeninformationen
     """
     path = os.path.join(os.getcwd(), "pflanzen_erweitert.csv")
-    df = pd.read_csv(path)
+    # PyArrow-Parser liest parallel; Temperaturen (ganze Grad) als int16, wiederkehrende Texte als Kategorien
+    df = pd.read_csv(path, engine="pyarrow")
     df.columns = df.columns.str.strip().str.lower().str.replace("\\", "", regex=False)
+    df = df.astype({
+        "min_temp": "int16",
+        "max_temp": "int16",
+        "standort": "category",
+        "licht": "category",
+        "level": "category",
+        "zeitaufwand": "category",
+    })
+    for c in ("standort", "licht", "level", "zeitaufwand"):
+        df[c + "_lc"] = df[c].str.lower().astype("category")
     return df
 
+# Sortierindex über min_temp für schnelle Temperatur-Vorauswahl
+@st.cache_data(show_spinner=False)
+def lade_temp_index() -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sortiert die Zeilenpositionen einmalig nach min_temp, damit die Vorauswahl
+    per binärer Suche statt per Vollscan erfolgen kann.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (Zeilenpositionen nach min_temp sortiert, sortierte min_temp-Werte)
+    """
+    min_temp = lade_csv()["min_temp"].to_numpy()
+    idx = np.argsort(min_temp, kind="stable")
+    return idx, min_temp[idx]
+
+# Filter-Kernel (Numba), einmal pro Prozess kompiliert und über Reruns hinweg gehalten
+@st.cache_resource
+def filter_kernel():
+    """
+    Kompiliert die Filterschleife für perfekte Treffer und Alternativen.
+
+    Returns:
+        Callable: filter(min_t, max_t, standort_c, licht_c, level_c, zeit_c, temp,
+                  standort, beides, licht, level, zeit) -> (perfect_mask, alt_mask)
+    """
+    import numba
+
+    @numba.njit(cache=True)
+    def _filter(min_t, max_t, standort_c, licht_c, level_c, zeit_c, temp, standort, beides, licht, level, zeit):
+        n = min_t.shape[0]
+        perfect = np.empty(n, np.bool_)
+        alt = np.empty(n, np.bool_)
+        for i in range(n):
+            standort_ok = (standort_c[i] == standort) | (standort_c[i] == beides)
+            in_range = (min_t[i] <= temp) & (max_t[i] >= temp)
+            near = (min_t[i] <= temp * 1.1) & (max_t[i] >= temp * 0.9)
+            p = in_range & standort_ok & (licht_c[i] == licht) & (level_c[i] == level) & (zeit_c[i] == zeit)
+            perfect[i] = p
+            alt[i] = near & standort_ok & (not p)
+        return perfect, alt
+
+    return _filter
+
+# Kategorie-Code eines Werts; -2 wenn der Wert nicht vorkommt (-1 steht bei Kategorien für fehlende Werte)
+def kategorie_code(col: pd.Series, wert: str) -> int:
+    """
+    Liefert den Code eines Werts in einer kategorialen Spalte.
+
+    Args:
+        col (pd.Series): Spalte mit dtype "category"
+        wert (str): Gesuchter Wert
+
+    Returns:
+        int: Kategorie-Code, oder -2 wenn der Wert nicht vorkommt
+    """
+    code = col.cat.categories.get_indexer([wert])[0]
+    return int(code) if code >= 0 else -2
+
+# JSON von einer URL laden
+def hole_json(client: httpx.Client, url: str) -> dict:
+    """
+    Ruft eine URL ab und liefert die JSON-Antwort.
+
+    Args:
+        client (httpx.Client): HTTP-Client aus get_http()
+        url (str): Vollständige API-URL
+
+    Returns:
+        dict: JSON-Daten
+
+    Raises:
+        httpx.HTTPError, ValueError: bei Netzwerk- oder Formatfehlern
+    """
+    res = client.get(url)
+    res.raise_for_status()
+    return res.json()
+
+# Geokoordinaten über Open-Meteo API abrufen (persistent 7 Tage gecacht, Schlüssel: Stadtname klein geschrieben)
+@cache.memoize(expire=7 * 24 * 3600, ignore={"client"})
+def _geocode(city_key: str, *, client: httpx.Client) -> dict[str, str | float] | None:
+    """
+    Fragt die Geocoding-API ab. Fehler werden nicht abgefangen, damit sie nicht im Cache landen.
+
+    Args:
+        city_key (str): Normalisierter Stadtname (z. B. "berlin")
+        client (httpx.Client): HTTP-Client aus get_http()
+
+    Returns:
+        dict[str, str | float] | None: Koordinaten und Ort, oder None ohne Treffer
+    """
+    url = f"https://geocoding-api.open-meteo.com/v1/search?name={city_key}&count=1&language=de&format=json"
+    data = hole_json(client, url)
+    if "results" in data and data["results"]:
+        r = data["results"][0]
+        return {
+            "lat": r.get("latitude"),
+            "lon": r.get("longitude"),
+            "stadt": r.get("name", ""),
+            "land": r.get("country", "")
+        }
+    return None
+
 # Geokoordinaten über Open-Meteo API abrufen um Standort zu bestimmen
 @st.cache_data(ttl=3600)
 def get_coords(city_name: str) -> dict[str, str | float] | None:
@@ -37,24 +186,62 @@ def get_coords(city_name: str) -> dict[str, str | float] | None:
     Returns:
         dict[str, str | float] | None: Koordinaten und Ort, oder None bei Fehler
     """
-    url = f"https://geocoding-api.open-meteo.com/v1/search?name={city_name}&count=1&language=de&format=json"
     try:
-        res = requests.get(url, timeout=5)
-        res.raise_for_status()
-        data = res.json()
-        if "results" in data and data["results"]:
-            r = data["results"][0]
-            return {
-                "lat": r.get("latitude"),
-                "lon": r.get("longitude"),
-                "stadt": r.get("name", ""),
-                "land": r.get("country", "")
-            }
-    except (requests.RequestException, ValueError):
+        return _geocode(city_name.strip().lower(), client=get_http())
+    except (httpx.HTTPError, ValueError):
         return None
 
-# Historische und aktuelle Wetterdaten abrufen
-@st.cache_data(ttl=600)
+# Einzelne Open-Meteo-Abfragen, jeweils mit eigener Cache-Dauer; der Client zählt nicht zum Cache-Schlüssel.
+# Archivdaten 2019–2023 ändern sich nicht mehr und werden unbegrenzt gespeichert.
+@cache.memoize(expire=None, ignore={"client"})
+def _get_hist(lat: float, lon: float, *, client: httpx.Client) -> dict:
+    """Historische Tageswerte (Temperatur, Sonnenscheindauer) 2019–2023."""
+    return hole_json(client, f"https://archive-api.open-meteo.com/v1/archive?latitude={lat}&longitude={lon}&start_date=2019-01-01&end_date=2023-12-31&daily=temperature_2m_mean,sunshine_duration&timezone=Europe%2FBerlin")
+
+@cache.memoize(expire=15 * 60, ignore={"client"})
+def _get_current(lat: float, lon: float, *, client: httpx.Client) -> dict:
+    """Aktuelle Temperatur, Luftfeuchtigkeit und UV-Index."""
+    return hole_json(client, f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m,relative_humidity_2m,uv_index&timezone=auto")
+
+@cache.memoize(expire=30 * 60, ignore={"client"})
+def _get_air(lat: float, lon: float, *, client: httpx.Client) -> dict:
+    """Aktueller europäischer Luftqualitätsindex."""
+    return hole_json(client, f"https://air-quality-api.open-meteo.com/v1/air-quality?latitude={lat}&longitude={lon}&current=european_aqi")
+
+# Abfrage absichern, damit ein fehlschlagender Endpunkt die übrigen nicht abbricht
+def _sicher(fetch, client: httpx.Client, lat: float, lon: float) -> dict:
+    """Führt eine Wetterabfrage aus und liefert bei Fehlern ein leeres dict."""
+    try:
+        return fetch(lat, lon, client=client)
+    except (httpx.HTTPError, ValueError):
+        return {}
+
+# Rohdaten der drei Wetter-APIs laden (über den Disk-Cache)
+def lade_wetter_rohdaten(client: httpx.Client, lat: float, lon: float) -> tuple[dict, dict, dict]:
+    """
+    Fragt Archiv, aktuelle Werte und Luftqualität parallel ab. Der Client wird vom
+    aufrufenden Thread übergeben, damit die Worker keine Streamlit-Caches ansprechen.
+
+    Args:
+        client (httpx.Client): HTTP-Client aus get_http()
+        lat (float): Breitengrad
+        lon (float): Längengrad
+
+    Returns:
+        tuple[dict, dict, dict]: (Archiv, aktuelle Werte, Luftqualität), leer bei Fehler
+    """
+    # Auf 3 Nachkommastellen (~100 m) runden, damit nahe Abfragen denselben Cache-Eintrag nutzen
+    lat, lon = round(lat, 3), round(lon, 3)
+
+    # Die drei APIs parallel abfragen – Wartezeit ≈ langsamste statt Summe aller Anfragen
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        futures = [ex.submit(_sicher, f, client, lat, lon) for f in (_get_hist, _get_current, _get_air)]
+        hist, aktuell, air = [f.result() for f in futures]
+    return hist, aktuell, air
+
+# Historische und aktuelle Wetterdaten abrufen – ohne eigenen Streamlit-Cache, damit ein
+# zeitweise fehlender Endpunkt nicht 10 Minuten lang als Teilergebnis hängen bleibt;
+# die einzelnen Endpunkte sind bereits im Disk-Cache mit eigener Laufzeit gespeichert
 def get_weather(lat: float, lon: float) -> tuple[float | None, float | None, float | None, float | None, float | None, float | None]:
     """
     Ruft Wetterdaten (Temperatur, Sonnenstunden, Luftfeuchtigkeit, UV, AQI) ab.
@@ -67,28 +254,110 @@ def get_weather(lat: float, lon: float) -> tuple[float | None, float | None, flo
         tuple: (Durchschnittstemperatur, Sonnenstunden, aktuelle Temperatur,
                 Luftfeuchtigkeit, UV-Index, Luftqualitätsindex)
     """
-    base = f"latitude={lat}&longitude={lon}"
-    hist_url = f"https://archive-api.open-meteo.com/v1/archive?{base}&start_date=2019-01-01&end_date=2023-12-31&daily=temperature_2m_mean,sunshine_duration&timezone=Europe%2FBerlin"
-    aktuell_url = f"https://api.open-meteo.com/v1/forecast?{base}&current=temperature_2m,relative_humidity_2m,uv_index&timezone=auto"
-    air_url = f"https://air-quality-api.open-meteo.com/v1/air-quality?{base}&current=european_aqi"
-
-    hist = requests.get(hist_url, timeout=5).json() #was passiert
-    aktuell = requests.get(aktuell_url, timeout=5).json()
-    air = requests.get(air_url, timeout=5).json()
+    hist, aktuell, air = lade_wetter_rohdaten(get_http(), lat, lon)
 
     temp = pd.Series(hist.get("daily", {}).get("temperature_2m_mean", [])).mean()
     sun = pd.Series(hist.get("daily", {}).get("sunshine_duration", [])).mean() / 3600
+    current = aktuell.get("current", {})
 
     return (
-        round(temp, 1) if temp else None,
-        round(sun, 1) if sun else None,
-        aktuell["current"].get("temperature_2m"),
-        aktuell["current"].get("relative_humidity_2m"),
-        aktuell["current"].get("uv_index"),
+        round(temp, 1) if pd.notna(temp) else None,
+        round(sun, 1) if pd.notna(sun) else None,
+        current.get("temperature_2m"),
+        current.get("relative_humidity_2m"),
+        current.get("uv_index"),
         air.get("current", {}).get("european_aqi"),
     )
 
-# HTML-Tag für visuelle Labels (z. B. "Anfänger", "Wenig Zeit")
+# Beliebte Städte, deren Standort- und Wetterdaten beim Serverstart vorgeladen werden
+BELIEBTE_STAEDTE = ["Berlin", "Zürich", "Wien", "München", "Hamburg"]
+
+def _vorwaermen(client: httpx.Client) -> None:
+    """Füllt den Disk-Cache mit Geokoordinaten und Wetterdaten der beliebten Städte."""
+    for stadt in BELIEBTE_STAEDTE:
+        try:
+            coords = _geocode(stadt.lower(), client=client)
+        except (httpx.HTTPError, ValueError):
+            continue
+        if coords:
+            lade_wetter_rohdaten(client, coords["lat"], coords["lon"])
+
+# Vorwärmen einmal pro Prozess im Hintergrund starten, ohne den ersten Seitenaufbau zu blockieren
+@st.cache_resource
+def starte_vorwaermen() -> threading.Thread:
+    """
+    Startet den Hintergrund-Thread zum Vorladen der Caches.
+
+    Returns:
+        threading.Thread: Laufender Daemon-Thread
+    """
+    t = threading.Thread(target=_vorwaermen, args=(get_http(),), daemon=True, name="cache-vorwaermen")
+    t.start()
+    return t
+
+starte_vorwaermen()
+
+# Wikipedia-Kurzbeschreibung zu einer Pflanze abrufen (1 Tag gecacht)
+@st.cache_data(ttl=86400, show_spinner=False)
+def fetch_wiki(_client: httpx.Client, name: str) -> dict[str, str | None] | None:
+    """
+    Ruft die Zusammenfassung des deutschen Wikipedia-Artikels ab.
+
+    Args:
+        _client (httpx.Client): HTTP-Client aus get_http() (wird von st.cache_data nicht gehasht)
+        name (str): Pflanzenname (z. B. "Basilikum")
+
+    Returns:
+        dict[str, str | None] | None: Titel, Auszug und Vorschaubild, oder None ohne Artikel
+    """
+    # Bekannte Artikel per ETag revalidieren – bei 304 wird die gespeicherte Zusammenfassung genutzt
+    key = f"wiki:{name}"
+    gespeichert = cache.get(key)
+    headers = {"If-None-Match": gespeichert[0]} if gespeichert else {}
+    res = _client.get(f"https://de.wikipedia.org/api/rest_v1/page/summary/{name}", headers=headers)
+    if res.status_code == 304 and gespeichert:
+        return gespeichert[1]
+    if res.status_code != 200:
+        return None
+    d = res.json()
+    summary = {
+        "title": d.get("title", name),
+        "extract": d.get("extract", ""),
+        "thumbnail": (d.get("thumbnail") or {}).get("source"),
+    }
+    if etag := res.headers.get("ETag"):
+        cache.set(key, (etag, summary))
+    return summary
+
+# Wikipedia-Zusammenfassungen für alle angezeigten Pflanzen parallel laden
+def lade_wiki(names: list[str]) -> dict[str, dict[str, str | None] | None]:
+    """
+    Lädt die Wikipedia-Zusammenfassungen gleichzeitig statt nacheinander pro Pflanze.
+
+    Args:
+        names (list[str]): Pflanzennamen
+
+    Returns:
+        dict: Pflanzenname -> Zusammenfassung (None bei Fehler oder ohne Artikel)
+    """
+    client = get_http()
+
+    def sicher(name: str) -> dict[str, str | None] | None:
+        try:
+            return fetch_wiki(client, name)
+        except (httpx.HTTPError, ValueError):
+            return None
+
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    # fetch_wiki ist ein Streamlit-Cache – die Worker bekommen den Kontext des laufenden Skripts
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=8, initializer=add_script_run_ctx, initargs=(None, ctx)) as ex:
+        return dict(zip(names, ex.map(sicher, names)))
+
+# HTML-Tag für visuelle Labels (z. B. "Anfänger", "Wenig Zeit") – wenige feste Kombinationen, daher gecacht
+@functools.lru_cache(maxsize=128)
 def tag_html(text: str, color: str, icon: str = "") -> str:
     """
     Erstellt ein HTML-basiertes Label-Element.
@@ -103,24 +372,48 @@ def tag_html(text: str, color: str, icon: str = "") -> str:
     """
     return f"<span style='background-color:{color};color:white;padding:4px 10px;margin-right:6px;border-radius:12px;font-size:13px;'>{icon}{text}</span>"
 
+# Tag-Zeile über den Empfehlungen – hängt nur von Level und Zeitaufwand ab
+# (cache_resource: überdauert Reruns und gibt den String ohne Kopie zurück)
+@st.cache_resource(show_spinner=False)
+def tags_header(level: str, zeit: str) -> str:
+    """
+    Erstellt die Label-Zeile für Erfahrungslevel, Zeitaufwand und Wasser.
+
+    Args:
+        level (str): Erfahrungslevel
+        zeit (str): Zeitaufwand
+
+    Returns:
+        str: HTML-Markup
+    """
+    return (
+        tag_html(level, "#1f77b4", "🧠 ") +
+        tag_html(zeit, "#ff7f0e", "🕓 ") +
+        tag_html("Wasser", "#2ca02c", "💧 ")
+    )
+
 # Anzeige von Wetterdaten im UI (als Metrik-Karten)
 def zeige_metriken(temp: float | None, sun: float | None, temp_now: float | None, hum: float | None, uv: float | None, air: float | None) -> None:
     """
     Zeigt Wetterdaten als Metriken in vier Spalten.
     """
+    # erst hier importieren – wird nur gebraucht, wenn Wetterdaten angezeigt werden
+    from streamlit_extras.metric_cards import style_metric_cards
+
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("📑 Ø Temp. (5 Jahre)", f"{temp} °C")
-    c2.metric("☀ Sonnenstunden/Tag", f"{sun:.1f} h")
-    c3.metric("🔥 Aktuelle Temp.", f"{temp_now} °C")
-    c4.metric("💧 Luftfeuchtigkeit", f"{hum} %")
+    c1.metric("📑 Ø Temp. (5 Jahre)", f"{temp} °C" if temp is not None else "–")
+    c2.metric("☀ Sonnenstunden/Tag", f"{sun:.1f} h" if sun is not None else "–")
+    c3.metric("🔥 Aktuelle Temp.", f"{temp_now} °C" if temp_now is not None else "–")
+    c4.metric("💧 Luftfeuchtigkeit", f"{hum} %" if hum is not None else "–")
     style_metric_cards(background_color="#101010", border_left_color="#0099ff", border_color="#0099ff")
     st.markdown("🧪 **Luftqualität**")
     st.markdown(f"🌍 AQI (EU): {air if air is not None else '–'}  |  🌞 UV: {uv if uv is not None else '–'}")
 
 # Darstellung einer Pflanze mit Bewertung und Infotext
-def zeige_pflanze(row: pd.Series, diff_val: float | None = None, klima_temp: float | None = None) -> None:
+def zeige_pflanze(row: pd.Series, diff_val: float | None = None, klima_temp: float | None = None, wiki_summary: dict[str, str | None] | None = None) -> None:
     """
     Zeigt eine Pflanze mit Bewertung, Klimaverträglichkeit und Wikipedia-Zusatzinfos.
+    Die Wikipedia-Daten werden vorab über lade_wiki() geholt und hier nur dargestellt.
     """
     # Bewertungstext basierend auf der Temperaturabweichung
     if diff_val is not None:
@@ -159,98 +452,113 @@ def zeige_pflanze(row: pd.Series, diff_val: float | None = None, klima_temp: flo
             else:
                 st.success(f"✅ Temperatur im Idealbereich ({row['min_temp']}–{row['max_temp']} °C)")
 
-        st.markdown(f"**📝 Beschreibung:** {row['beschreibung']}")
-        st.markdown(f"**🌸 Blütezeit:** {row['blütezeit']}")
-        st.markdown(f"**📍 Standort:** {row['standort']}")
-        st.markdown(f"**💡 Licht:** {row['licht']}")
-        st.markdown(f"**🌱 Bodenart:** {row['bodenart']}")
-        st.markdown(f"**🤝 Gute Nachbarn:** {row['begleitpflanzen']}")
-        st.markdown(f"**📆 Monatstipps:** {row['monats_tipps']}")
+        # Steckbrief als ein Markdown-Block – ein Element statt sieben einzelner Nachrichten ans Frontend
+        st.markdown("\n\n".join([
+            f"**📝 Beschreibung:** {row['beschreibung']}",
+            f"**🌸 Blütezeit:** {row['blütezeit']}",
+            f"**📍 Standort:** {row['standort']}",
+            f"**💡 Licht:** {row['licht']}",
+            f"**🌱 Bodenart:** {row['bodenart']}",
+            f"**🤝 Gute Nachbarn:** {row['begleitpflanzen']}",
+            f"**📆 Monatstipps:** {row['monats_tipps']}",
+        ]))
 
         if row["max_temp"] < 30:
             st.warning("🔥 Keine starke Hitze verträglich.")
         if row["min_temp"] <= 5:
             st.success("❄️ Winterhart – kein Schutz nötig.")
 
-        try:
-            wiki = f"https://de.wikipedia.org/api/rest_v1/page/summary/{row['name']}"
-            res = requests.get(wiki, timeout=5)
-            if res.status_code == 200:
-                d = res.json()
-                st.markdown(f"**📖 {d.get('title', row['name'])} – Wikipedia:**\n\n{d.get('extract','')}")
-                if thumb := d.get("thumbnail"):
-                    st.image(thumb["source"], width=200)
-        except requests.RequestException:
-            pass
+        if wiki_summary:
+            st.markdown(f"**📖 {wiki_summary['title']} – Wikipedia:**\n\n{wiki_summary['extract']}")
+            if thumb := wiki_summary["thumbnail"]:
+                st.image(thumb, width=200)
 
-# UI – Header
-st.markdown("""
-<h1 style='color:white;'>🌱 SeedTogether Pflanzenberater</h1>
-<p style='font-size:18px; color:white;'>
-Finde passende Pflanzen für Balkon oder Garten basierend auf deinem Standort.
-</p>
-""", unsafe_allow_html=True)
+# Empfehlungsbereich als Fragment: Änderungen an den Vorlieben rendern nur diesen Bereich neu,
+# ohne Standortsuche und Wetterabfrage erneut auszuführen
+@st.fragment
+def render_recommendations(pflanzen_df: pd.DataFrame, stadt: str, coords: dict[str, str | float] | None, wetter: tuple | None) -> None:
+    """
+    Fragt Standorttyp, Licht, Erfahrung und Zeitaufwand ab, zeigt darunter Standort und
+    Wetter, filtert die Pflanzen passend zu Klima und Angaben und zeigt die Empfehlungen an.
+    Standort- und Wetterdaten werden im Hauptskript abgerufen und hier nur dargestellt.
 
-# UI – Nutzereingaben
-stadt = st.text_input("📍 Standort eingeben", placeholder="z. B. Berlin")
-standort = st.radio("🏡 Standorttyp", ["Balkon", "Garten"], horizontal=True)
-licht = st.selectbox("💡 Wie hell ist dein Standort?", ["sonnig", "halbschattig", "schattig"])
-level = st.selectbox("👤 Dein Erfahrungslevel", ["Anfänger", "Fortgeschritten", "Experte"])
-zeit = st.selectbox("⏱️ Wie viel Zeit willst du investieren?", ["Wenig", "Mittel", "Hoch"])
+    Args:
+        pflanzen_df (pd.DataFrame): Pflanzentabelle aus lade_csv()
+        stadt (str): Eingegebener Stadtname
+        coords (dict[str, str | float] | None): Gefundener Standort, None ohne Treffer
+        wetter (tuple | None): Rückgabe von get_weather(), None ohne Standort
+    """
+    standort = st.radio("🏡 Standorttyp", ["Balkon", "Garten"], horizontal=True)
+    licht = st.selectbox("💡 Wie hell ist dein Standort?", ["sonnig", "halbschattig", "schattig"])
+    level = st.selectbox("👤 Dein Erfahrungslevel", ["Anfänger", "Fortgeschritten", "Experte"])
+    zeit = st.selectbox("⏱️ Wie viel Zeit willst du investieren?", ["Wenig", "Mittel", "Hoch"])
 
-# Standortdaten abrufen
-coords = None
-if stadt:
-    with st.spinner("🔍 Suche Standort und Wetter…"):
-        coords = get_coords(stadt)
+    # Standort und Wetter unter den Eingaben anzeigen
+    if stadt:
         if coords:
-            temp, sun, temp_now, hum, uv, air = get_weather(coords["lat"], coords["lon"])
-    if coords:
-        st.success(f"📍 Gefunden: {coords['stadt']}, {coords['land']}")
-        zeige_metriken(temp, sun, temp_now, hum, uv, air)
+            st.success(f"📍 Gefunden: {coords['stadt']}, {coords['land']}")
+            zeige_metriken(*wetter)
+        else:
+            st.warning("❗ Stadt nicht gefunden. Bitte korrigieren.")
+
+    if not coords:
+        return
+    temp = wetter[0]
+    if temp is None:
+        st.warning("⚠️ Klimadaten konnten nicht geladen werden – Empfehlungen sind gerade nicht möglich.")
+        return
+
+    # Vorauswahl: nur Pflanzen mit min_temp <= Obergrenze (binäre Suche), Reihenfolge der CSV bleibt erhalten
+    min_idx, min_sorted = lade_temp_index()
+    obergrenze = max(temp, temp * 1.1)
+    vorauswahl = pflanzen_df.iloc[np.sort(min_idx[:np.searchsorted(min_sorted, obergrenze, side="right")])]
+
+    # Ein Durchlauf: alle Bedingungen in einer kompilierten Schleife über die Rohdaten-Arrays,
+    # Textspalten als Kategorie-Codes (kein zweiter Filter, kein isin über Namen)
+    min_t = vorauswahl["min_temp"].to_numpy()
+    max_t = vorauswahl["max_temp"].to_numpy()
+    perfect_mask, alt_mask = filter_kernel()(
+        min_t,
+        max_t,
+        vorauswahl["standort_lc"].cat.codes.to_numpy(),
+        vorauswahl["licht_lc"].cat.codes.to_numpy(),
+        vorauswahl["level_lc"].cat.codes.to_numpy(),
+        vorauswahl["zeitaufwand_lc"].cat.codes.to_numpy(),
+        temp,
+        kategorie_code(vorauswahl["standort_lc"], standort.lower()),
+        kategorie_code(vorauswahl["standort_lc"], "beides"),
+        kategorie_code(vorauswahl["licht_lc"], licht.lower()),
+        kategorie_code(vorauswahl["level_lc"], level.lower()),
+        kategorie_code(vorauswahl["zeitaufwand_lc"], zeit.lower()),
+    )
+    perfect = vorauswahl[perfect_mask]
+
+    # Keine Alternativen übrig (z. B. alle Pflanzen sind perfekte Treffer) – Abweichungsberechnung überspringen
+    if not alt_mask.any():
+        similar = vorauswahl.iloc[:0]
     else:
-        st.warning("❗ Stadt nicht gefunden. Bitte korrigieren.")
+        candidates = vorauswahl[alt_mask].copy()
 
-# Pflanzen einlesen und filtern
-try:
-    pflanzen_df = lade_csv()
-except FileNotFoundError:
-    st.error("❌ Datei 'pflanzen_erweitert.csv' fehlt.")
-    st.stop()
+        # Abweichung der Temperaturmitte direkt auf den NumPy-Arrays berechnen
+        diff = np.abs((min_t[alt_mask] + max_t[alt_mask]) * 0.5 - temp)
+        candidates["diff"] = diff
+        # Top 3 per stabiler Sortierung – bei gleicher Abweichung gewinnt die frühere CSV-Zeile
+        similar = candidates.iloc[np.argsort(diff, kind="stable")[:3]]
+    zufall = pflanzen_df.sample(5, random_state=1) if perfect.empty and similar.empty else pflanzen_df.iloc[:0]
 
-if coords and temp is not None:
-    perfect = pflanzen_df[
-        (pflanzen_df["min_temp"] <= temp) &
-        (pflanzen_df["max_temp"] >= temp) &
-        (pflanzen_df["standort"].str.lower().isin([standort.lower(), "beides"])) &
-        (pflanzen_df["licht"].str.lower() == licht.lower()) &
-        (pflanzen_df["level"].str.lower() == level.lower()) &
-        (pflanzen_df["zeitaufwand"].str.lower() == zeit.lower())
-    ]
-
-    candidates = pflanzen_df[
-        (pflanzen_df["min_temp"] <= temp * 1.1) &
-        (pflanzen_df["max_temp"] >= temp * 0.9) &
-        (pflanzen_df["standort"].str.lower().isin([standort.lower(), "beides"]))
-    ].copy()
-    candidates["temp_mid"] = (candidates["min_temp"] + candidates["max_temp"]) / 2
-    candidates["diff"] = (candidates["temp_mid"] - temp).abs()
-    similar = candidates[~candidates["name"].isin(perfect["name"])].nsmallest(3, "diff")
+    # Wikipedia-Infos für alle anzuzeigenden Pflanzen in einem Schritt vorladen
+    with st.spinner("📖 Lade Pflanzeninfos…"):
+        wiki = lade_wiki(list(perfect["name"]) + list(similar["name"]) + list(zufall["name"]))
 
     st.markdown("## 🌿 Empfohlene Pflanzen")
-    st.markdown(
-        tag_html(level, "#1f77b4", "🧠 ") +
-        tag_html(zeit, "#ff7f0e", "🕓 ") +
-        tag_html("Wasser", "#2ca02c", "💧 "),
-        unsafe_allow_html=True,
-    )
+    st.markdown(tags_header(level, zeit), unsafe_allow_html=True)
 
     if perfect.empty:
         st.info("🚫 Keine perfekte Übereinstimmung gefunden.")
     else:
         st.markdown("### 🔥 Perfekte Treffer")
         for _, row in perfect.iterrows():
-            zeige_pflanze(row, klima_temp=temp)
+            zeige_pflanze(row, klima_temp=temp, wiki_summary=wiki.get(row["name"]))
 
     if not similar.empty:
         st.markdown("### 🌱 Nahe Alternativen")
@@ -260,15 +568,70 @@ if coords and temp is not None:
             "oder Winterschutz – können sie trotzdem gut gedeihen."
         )
         for _, row in similar.iterrows():
-            zeige_pflanze(row, round(row["diff"], 1), klima_temp=temp)
+            zeige_pflanze(row, round(row["diff"], 1), klima_temp=temp, wiki_summary=wiki.get(row["name"]))
 
 
-    if perfect.empty and similar.empty:
+    if not zufall.empty:
         st.markdown("### 🎲 Zufällige Vorschläge")
         st.info(
             "Hier sind zufällig ausgewählte Pflanzen, die nicht exakt zu deinem Standort passen. "
             "Sie können als Inspiration dienen – prüfe die Details und entscheide, "
             "ob du sie mit etwas Aufwand dennoch kultivieren möchtest."
         )
-        for _, row in pflanzen_df.sample(5, random_state=1).iterrows():
-            zeige_pflanze(row, klima_temp=temp)
+        for _, row in zufall.iterrows():
+            zeige_pflanze(row, klima_temp=temp, wiki_summary=wiki.get(row["name"]))
+
+# Gesamte Pflanzenliste seitenweise als Tabelle – Blättern rendert nur dieses Fragment neu
+@st.fragment
+def zeige_alle_pflanzen(pflanzen_df: pd.DataFrame, page_size: int = 10) -> None:
+    """
+    Zeigt alle Pflanzen als Tabelle, jeweils nur eine Seite auf einmal.
+
+    Args:
+        pflanzen_df (pd.DataFrame): Pflanzentabelle aus lade_csv()
+        page_size (int, optional): Zeilen pro Seite
+    """
+    if not st.toggle("📋 Alle Pflanzen anzeigen"):
+        return
+    seiten = max(1, -(-len(pflanzen_df) // page_size))
+    seite = st.number_input("Seite", min_value=1, max_value=seiten, value=1, step=1)
+    start = (seite - 1) * page_size
+    st.dataframe(
+        pflanzen_df.iloc[start:start + page_size],
+        column_order=[c for c in pflanzen_df.columns if not c.endswith("_lc")],
+        hide_index=True,
+    )
+    st.caption(f"Seite {seite} von {seiten} · {len(pflanzen_df)} Pflanzen")
+
+# UI – Header
+st.markdown("""
+<h1 style='color:white;'>🌱 SeedTogether Pflanzenberater</h1>
+<p style='font-size:18px; color:white;'>
+Finde passende Pflanzen für Balkon oder Garten basierend auf deinem Standort.
+</p>
+""", unsafe_allow_html=True)
+
+# UI – Nutzereingaben
+stadt = st.text_input("📍 Standort eingeben", placeholder="z. B. Berlin")
+
+# Standortdaten abrufen
+coords = None
+wetter = None
+if stadt:
+    with st.spinner("🔍 Suche Standort und Wetter…"):
+        coords = get_coords(stadt)
+        if coords:
+            wetter = get_weather(coords["lat"], coords["lon"])
+
+# Pflanzen einlesen und filtern
+try:
+    pflanzen_df = lade_csv()
+except FileNotFoundError:
+    st.error("❌ Datei 'pflanzen_erweitert.csv' fehlt.")
+    st.stop()
+
+# Vorlieben und Empfehlungen (Fragment – Änderungen dort lösen keine neue Wetterabfrage aus)
+render_recommendations(pflanzen_df, stadt, coords, wetter)
+
+# Gesamte Pflanzenliste auf Wunsch anzeigen (nutzt die bereits geladene Tabelle)
+zeige_alle_pflanzen(pflanzen_df)